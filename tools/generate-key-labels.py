@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+# Generates the key label SVGs for the on-screen keyboard. Requires
+# Inkscape on the PATH to convert the label text to paths, so the
+# emulator does not depend on the font being installed.
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import tempfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import unescape
+
+# fontTools converts label text to paths in-process, which avoids
+# spawning Inkscape at all. It is optional: without it (or without the
+# font file) the script falls back to Inkscape.
+try:
+    from fontTools.pens.svgPathPen import SVGPathPen
+    from fontTools.ttLib import TTFont
+except ImportError:
+    TTFont = None
+
+FONT_FILENAME = "OpenSans-Regular.ttf"
+GLYPH_CACHE_FILENAME = "glyph_cache.json"
+
+TEXT_TMPL = (
+    '<text x="{x}" y="{y}" font-family="Open Sans" font-size="{size}" '
+    'fill="white" stroke="white" text-anchor="middle" '
+    'dominant-baseline="middle">{label}</text>'
+)
+
+
+# Key rows as (name, x, y, width, labels). Label strings are
+# pre-escaped for embedding in SVG text elements.
+KEY_DEFS = (
+    ("Escape", 0, 0, 100, ("ESC",)),
+    ("Digit1", 100, 0, 100, ("!", "1")),
+    ("Digit2", 200, 0, 100, ('"', "2")),
+    ("Digit3", 300, 0, 100, ("#", "3")),
+    ("Digit4", 400, 0, 100, ("$", "4")),
+    ("Digit5", 500, 0, 100, ("%", "5")),
+    ("Digit6", 600, 0, 100, ("&amp;", "6")),
+    ("Digit7", 700, 0, 100, ("'", "7")),
+    ("Digit8", 800, 0, 100, ("(", "8")),
+    ("Digit9", 900, 0, 100, (")", "9")),
+    ("Digit0", 1000, 0, 100, ("_", "0")),
+    ("Minus", 1100, 0, 100, ("=", "-")),
+    ("Caret", 1200, 0, 100, ("£", "^")),
+    ("Clear", 1300, 0, 100, ("CLR",)),
+    ("Delete", 1400, 0, 100, ("DEL",)),
+    ("Tab", 0, 100, 150, ("TAB",)),
+    ("Q", 150, 100, 100, ("Q",)),
+    ("W", 250, 100, 100, ("W",)),
+    ("E", 350, 100, 100, ("E",)),
+    ("R", 450, 100, 100, ("R",)),
+    ("T", 550, 100, 100, ("T",)),
+    ("Y", 650, 100, 100, ("Y",)),
+    ("U", 750, 100, 100, ("U",)),
+    ("I", 850, 100, 100, ("I",)),
+    ("O", 950, 100, 100, ("O",)),
+    ("P", 1050, 100, 100, ("P",)),
+    ("At", 1150, 100, 100, ("|", "@")),
+    ("BracketLeft", 1250, 100, 100, ("{", "[")),
+    ("Return", 1350, 100, 150, ("RETURN",)),
+    ("CapsLock", 0, 200, 175, ("CAPS LOCK",)),
+    ("A", 175, 200, 100, ("A",)),
+    ("S", 275, 200, 100, ("S",)),
+    ("D", 375, 200, 100, ("D",)),
+    ("F", 475, 200, 100, ("F",)),
+    ("G", 575, 200, 100, ("G",)),
+    ("H", 675, 200, 100, ("H",)),
+    ("J", 775, 200, 100, ("J",)),
+    ("K", 875, 200, 100, ("K",)),
+    ("L", 975, 200, 100, ("L",)),
+    ("Colon", 1075, 200, 100, ("*", ":")),
+    ("Semicolon", 1175, 200, 100, ("+", ";")),
+    ("BracketRight", 1275, 200, 100, ("}", "]")),
+    ("ShiftLeft", 0, 300, 225, ("SHIFT",)),
+    ("Z", 225, 300, 100, ("Z",)),
+    ("X", 325, 300, 100, ("X",)),
+    ("C", 425, 300, 100, ("C",)),
+    ("V", 525, 300, 100, ("V",)),
+    ("B", 625, 300, 100, ("B",)),
+    ("N", 725, 300, 100, ("N",)),
+    ("M", 825, 300, 100, ("M",)),
+    ("Comma", 925, 300, 100, ("&lt;", ",")),
+    ("Period", 1025, 300, 100, ("&gt;", ".")),
+    ("Slash", 1125, 300, 100, ("?", "/")),
+    ("Backslash", 1225, 300, 100, ("`", "\\")),
+    ("ShiftRight", 1325, 300, 175, ("SHIFT",)),
+    ("Control", 0, 400, 150, ("CTRL",)),
+    ("Copy", 150, 400, 100, ("COPY",)),
+    ("Space", 250, 400, 900, ("SPACE",)),
+    ("Numpad7", 1550, 0, 100, ("f7",)),
+    ("Numpad8", 1650, 0, 100, ("f8",)),
+    ("Numpad9", 1750, 0, 100, ("f9",)),
+    ("Numpad4", 1550, 100, 100, ("f4",)),
+    ("Numpad5", 1650, 100, 100, ("f5",)),
+    ("Numpad6", 1750, 100, 100, ("f6",)),
+    ("Numpad1", 1550, 200, 100, ("f1",)),
+    ("Numpad2", 1650, 200, 100, ("f2",)),
+    ("Numpad3", 1750, 200, 100, ("f3",)),
+    ("Numpad0", 1550, 300, 100, ("f0",)),
+    ("NumpadPeriod", 1650, 300, 100, (".",)),
+    ("Enter", 1750, 300, 100, ("ENTER",)),
+    ("CursorUp", 1950, 0, 100, ("▲",)),
+    ("CursorLeft", 1850, 100, 100, ("◀",)),
+    ("CursorDown", 1950, 100, 100, ("▼",)),
+    ("CursorRight", 2050, 100, 100, ("▶",)),
+    ("JoystickIcon", 1850, 200, 100, ("◉",)),
+    ("JoystickUp", 1950, 200, 100, ("▲",)),
+    ("JoystickLeft", 1850, 300, 100, ("◀",)),
+    ("JoystickDown", 1950, 300, 100, ("▼",)),
+    ("JoystickRight", 2050, 300, 100, ("▶",)),
+    ("JoystickFire1", 1850, 400, 100, ("FIRE 1",)),
+    ("JoystickFire2", 1950, 400, 100, ("FIRE 2",)),
+)
+
+# Transposed into parallel tuples: the rows above stay easy to edit,
+# while iteration runs over flat tuples instead of a list of objects.
+NAMES, XS, YS, WIDTHS, LABELS = zip(*KEY_DEFS)
+
+
+# Font sizes for keys that deviate from the default of 40.
+SPECIAL_SIZES = {
+    "JoystickUp": 25,
+    "JoystickDown": 25,
+    "JoystickLeft": 25,
+    "JoystickRight": 25,
+    "JoystickFire1": 25,
+    "JoystickFire2": 25,
+    "JoystickIcon": 70,
+}
+
+
+# Resolve the label layout for every key: one or two lines of text,
+# each centered on (x, y) at a given font size.
+def precompute() -> list[tuple[str, list[tuple[int, int, int, str]]]]:
+    layouts = []
+    for i in range(len(NAMES)):
+        size = SPECIAL_SIZES.get(NAMES[i], 40)
+        x = XS[i] + WIDTHS[i] // 2
+
+        if len(LABELS[i]) == 1:
+            lines = [(x, YS[i] + 50, size, LABELS[i][0])]
+        else:
+            lines = [
+                (x, YS[i] + 30, size, LABELS[i][0]),
+                (x, YS[i] + 70, size, LABELS[i][1]),
+            ]
+        layouts.append((NAMES[i], lines))
+    return layouts
+
+
+layouts = precompute()
+
+
+# A good part of Inkscape's startup goes into scanning the system font
+# directories and probing the user profile. Point it at a minimal
+# fontconfig setup that only knows the label font, plus a throwaway
+# profile dir. The fc-cache run is a no-op when the cache is warm.
+# Returns None (inherit the environment unchanged) if that is not
+# possible here.
+def inkscape_env() -> dict[str, str] | None:
+    if not os.path.exists(FONT_FILENAME):
+        return None
+
+    config_dir = os.path.join(tempfile.gettempdir(), "ronald-inkscape")
+    os.makedirs(os.path.join(config_dir, "cache"), exist_ok=True)
+    os.makedirs(os.path.join(config_dir, "profile"), exist_ok=True)
+
+    font_dir = os.path.dirname(os.path.abspath(FONT_FILENAME))
+    with open(os.path.join(config_dir, "fonts.conf"), "w") as config_file:
+        config_file.write(
+            '<?xml version="1.0"?>'
+            '<!DOCTYPE fontconfig SYSTEM "fonts.dtd">'
+            "<fontconfig>"
+            f"<dir>{font_dir}</dir>"
+            f"<cachedir>{config_dir}/cache</cachedir>"
+            "</fontconfig>"
+        )
+
+    env = {
+        **os.environ,
+        "FONTCONFIG_PATH": config_dir,
+        "INKSCAPE_PROFILE_DIR": os.path.join(config_dir, "profile"),
+    }
+    try:
+        subprocess.run(
+            ["fc-cache", "-f"],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        return None
+    return env
+
+
+# Convert a label to path markup centered on the origin, like the
+# Inkscape output. Returns None if the font lacks a glyph for one of
+# the characters, in which case the caller falls back to Inkscape.
+def text_to_path(font: TTFont, label: str, size: int) -> str | None:
+    glyph_set = font.getGlyphSet()
+    cmap = font.getBestCmap()
+    scale = size / font["head"].unitsPerEm
+    cap_height = getattr(font["OS/2"], "sCapHeight", 0) or font["hhea"].ascent
+
+    parts = []
+    advance = 0
+    for char in unescape(label):
+        if ord(char) not in cmap:
+            return None
+        glyph = glyph_set[cmap[ord(char)]]
+        pen = SVGPathPen(glyph_set)
+        glyph.draw(pen)
+        commands = pen.getCommands()
+        if commands:
+            parts.append(f'<path transform="translate({advance},0)" d="{commands}"/>')
+        advance += glyph.width
+
+    # Flip the y-up font coordinates, scale to the font size, and
+    # center the text on the origin: the run's midpoint goes to x=0 and
+    # the middle of the cap height to y=0, matching the text-anchor and
+    # dominant-baseline attributes the Inkscape path used.
+    transform = f"scale({scale},-{scale}) translate({-advance / 2},{-cap_height / 2})"
+    return f'<g transform="{transform}" fill="white" stroke="white">' + "".join(parts) + "</g>"
+
+
+def main() -> None:
+    try:
+        with open(GLYPH_CACHE_FILENAME) as cache_file:
+            glyph_cache = json.load(cache_file)
+    except FileNotFoundError:
+        glyph_cache = {}
+
+    # Only labels missing from the cache go through Inkscape. Each one
+    # is rendered centered on the origin, so the converted paths can be
+    # reused at any position (and by any number of keys) via a
+    # translate. Identical labels such as the two SHIFT keys are
+    # converted only once even on a cold run.
+    missing = []
+    for _, lines in layouts:
+        for _, _, size, label in lines:
+            if f"{label}@{size}" not in glyph_cache and (label, size) not in missing:
+                missing.append((label, size))
+
+    cache_dirty = bool(missing)
+
+    # Prefer the in-process conversion; anything the font cannot
+    # represent (or every label, if fontTools or the font file is not
+    # available) falls through to Inkscape below.
+    if missing and TTFont is not None and os.path.exists(FONT_FILENAME):
+        font = TTFont(FONT_FILENAME)
+        fallback = []
+        for label, size in missing:
+            markup = text_to_path(font, label, size)
+            if markup is None:
+                fallback.append((label, size))
+            else:
+                glyph_cache[f"{label}@{size}"] = markup
+        missing = fallback
+
+    if missing:
+        parts = ['<svg xmlns="http://www.w3.org/2000/svg">']
+        for index, (label, size) in enumerate(missing):
+            parts.append(f'<g id="glyph{index}">')
+            parts.append(TEXT_TMPL.format(x=0, y=0, size=size, label=label))
+            parts.append("</g>")
+        parts.append("</svg>")
+
+        # Pipe the document through Inkscape instead of round-tripping
+        # it over temp files on disk. check=True makes a failed
+        # conversion raise here rather than silently producing empty
+        # key files.
+        converted = subprocess.run(
+            [
+                "inkscape",
+                "--pipe",
+                "--actions",
+                "select-all:all;object-to-path;",
+                "--export-type=svg",
+                "-o",
+                "-",
+            ],
+            input="".join(parts).encode(),
+            stdout=subprocess.PIPE,
+            check=True,
+            env=inkscape_env(),
+        ).stdout
+
+        ET.register_namespace("", "http://www.w3.org/2000/svg")
+        ns = {"svg": "http://www.w3.org/2000/svg"}
+        root = ET.fromstring(converted)
+        for group in root.findall(".//svg:g", ns):
+            group_id = group.get("id", "")
+            if group_id.startswith("glyph"):
+                label, size = missing[int(group_id[len("glyph"):])]
+                glyph_cache[f"{label}@{size}"] = "".join(
+                    ET.tostring(path, encoding="unicode")
+                    for path in group.findall(".//svg:path", ns)
+                )
+
+    if cache_dirty:
+        with open(GLYPH_CACHE_FILENAME, "w") as cache_file:
+            json.dump(glyph_cache, cache_file)
+
+    os.makedirs("../assets/keys", exist_ok=True)
+
+    script_mtime = os.path.getmtime(__file__)
+    for name, lines in layouts:
+        output_filename = f"../assets/keys/{name}.partial.svg"
+
+        # Skip keys whose output is already up to date. The hash of the
+        # layout (and of this script) is embedded in the file as a
+        # comment, so an edit to a single key only regenerates that key.
+        digest = hashlib.blake2b(
+            repr((name, lines, script_mtime)).encode(), digest_size=8
+        ).hexdigest()
+        try:
+            with open(output_filename) as output_file:
+                if f"<!--h={digest}-->" in output_file.readline():
+                    continue
+        except FileNotFoundError:
+            pass
+
+        with open(output_filename, "w") as output_file:
+            output_file.write(f"<!--h={digest}-->\n")
+            for x, y, size, label in lines:
+                markup = glyph_cache[f"{label}@{size}"]
+                output_file.write(f'<g transform="translate({x},{y})">{markup}</g>')
+
+
+if __name__ == "__main__":
+    main()